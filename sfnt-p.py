@@ -1,23 +1,48 @@
 # Copyright 2024 Clerk Ma
 import os, sys, argparse
 import struct
+import array
+import mmap
+import codecs
 from collections import namedtuple
+from functools import wraps, lru_cache, partial
+from html import escape
 from PySide6.QtCore import (
-    QSize
+    QSize, QAbstractItemModel, QAbstractTableModel, QModelIndex,
+    QObject, QRunnable, QThreadPool, Signal
 )
 from PySide6.QtGui import (
-    QFont, QIcon, Qt, QColor
+    QFont, QIcon, Qt
 )
 from PySide6.QtWidgets import (
-    QApplication, QPushButton, QLabel, QWidget,
-    QVBoxLayout, QHBoxLayout, QGroupBox, QScrollArea,
-    QDialog, QTableWidget, QTableWidgetItem, QListWidget, QListWidgetItem,
-    QListView, QMessageBox
+    QApplication, QLabel, QWidget,
+    QVBoxLayout, QGroupBox, QScrollArea,
+    QDialog, QTableView, QTreeView, QMessageBox
 )
 
-SFNT_MAGIC_1 = [0x4F54544F, 0x00010000]
-SFNT_MAGIC_N = [0x74746366]
+SFNT_MAGIC_1 = frozenset([0x4F54544F, 0x00010000])
+SFNT_MAGIC_N = frozenset([0x74746366])
+SFNT_MAGIC = SFNT_MAGIC_1 | SFNT_MAGIC_N
 
+U16 = struct.Struct(">H")
+SFNT_HEADER = struct.Struct(">L4H")
+TABLE_RECORD = struct.Struct(">4s3L")
+NAME_HEADER = struct.Struct(">3H")
+NAME_RECORD = struct.Struct(">6H")
+HEAD_TABLE = struct.Struct(">2H3L2H2Q4h2H3h")
+XHEA_TABLE = struct.Struct(">2H3hH3h3h8xhH")
+LAYOUT_HEADER = struct.Struct(">5H")
+TAG_RECORD = struct.Struct(">4sH")
+SCRIPT_TABLE = struct.Struct(">2H")
+LANG_SYS = struct.Struct(">3H")
+
+@lru_cache
+def ttc_header(count):
+    return struct.Struct(f">LHHL{count}L")
+
+table_record = namedtuple("table_record", [
+    "tag", "checksum", "offset", "length"
+])
 head_table = namedtuple("head_table", [
     "major_version", "minor_version", "font_revision",
     "checksum_adjustment", "magic_number",
@@ -43,217 +68,351 @@ xhea_translation = {
     "_h_": "_v_",
     "x_max_": "y_max_",
 }
+vhea_fields = xhea_table._fields
+for src, dst in xhea_translation.items():
+    vhea_fields = tuple(key.replace(src, dst) for key in vhea_fields)
+name_encoding = {
+    2: "cp932",
+    3: "cp936",
+    4: "cp950",
+    5: "cp949",
+    6: "johab",
+}
+name_decoder = {k: codecs.getdecoder(v) for k, v in name_encoding.items()}
+utf_16_be_decoder = codecs.getdecoder("utf_16_be")
+PLATFORM_FONT = {"win32": "Consolas", "darwin": "Menlo"}.get(sys.platform, "Courier")
+PLATFORM_STYLE = "* {font-family: '%s';}" % PLATFORM_FONT
+
+class LazyString:
+    __slots__ = ("data", "decoder", "string")
+
+    def __init__(self, data, decoder):
+        self.data = data
+        self.decoder = decoder
+        self.string = None
+
+    def __str__(self):
+        if self.string is None:
+            self.string = self.decoder(self.data)[0]
+            self.data = None
+        return self.string
+
+def cached(parse):
+    @wraps(parse)
+    def wrapper(self, table):
+        key = (table.tag, table.offset)
+        if key not in self.cache:
+            self.cache[key] = parse(self, table)
+        return self.cache[key]
+    return wrapper
 
 class FileParser:
-    font_list = []
     def __init__(self, filename):
-        with open(filename, "rb") as src:
-            self.data = src.read()
+        self.font_list = []
+        self.cache = {}
+        self.mm = None
+        try:
+            with open(filename, "rb") as src:
+                self.mm = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+            self.data = memoryview(self.mm)
+            offset_list = self.parse_offset_list()
+            for x in offset_list:
+                font = self.parse_one(x)
+                self.font_list.append(font)
+        except Exception as error:
+            print("Error", error)
+        if not self.font_list:
+            self.close()
+
+    def close(self):
+        if self.mm is not None:
+            self.data.release()
             try:
-                offset_list = self.parse_offset_list()
-                for x in offset_list:
-                    font = self.parse_one(x)
-                    self.font_list.append(font)
-            except Exception as error:
-                print("Error", error)
+                self.mm.close()
+            except BufferError:
+                # a slice still held by a traceback; freed with the last view
+                pass
+            self.mm = None
 
     def parse_offset_list(self):
-        magic = struct.unpack_from(">L", self.data)[0]
+        magic = int.from_bytes(self.data[:4], "big")
+        if magic not in SFNT_MAGIC:
+            return ()
         if magic in SFNT_MAGIC_N:
-            _, _, _, count = struct.unpack_from(">LHHL", self.data, 0)
-            return struct.unpack_from(f">{count}L", self.data, 12)
-        elif magic in SFNT_MAGIC_1:
-            return [0]
-        return []
+            count = int.from_bytes(self.data[8:12], "big")
+            return ttc_header(count).unpack_from(self.data, 0)[4:]
+        return (0,)
 
     def parse_one(self, offset):
-        _, count, _, _, _ = struct.unpack_from(">L4H", self.data, offset)
-        table_list = []
-        for x in range(count):
-            table = struct.unpack_from(">4s3L", self.data, offset + 12 + 16 * x)
-            table_list.append(table)
-        return table_list
+        _, count, _, _, _ = SFNT_HEADER.unpack_from(self.data, offset)
+        records = self.iter_records(TABLE_RECORD, self.data, offset + SFNT_HEADER.size, count)
+        return list(map(table_record._make, records))
 
     def seg(self, data, start, length):
         return data[start:start+length]
 
+    def iter_records(self, record, data, start, count):
+        return record.iter_unpack(self.seg(data, start, record.size * count))
+
+    def read_array(self, code, data, start, count):
+        values = array.array(code)
+        values.frombytes(self.seg(data, start, values.itemsize * count))
+        if sys.byteorder == "little":
+            values.byteswap()
+        return values
+
+    @cached
     def parse_xhea(self, table):
-        data = self.seg(self.data, table[2], table[3])
-        vars = struct.unpack_from(">2H3hH3h3h8xhH", data, 0)
+        vars = XHEA_TABLE.unpack_from(self.data, table.offset)
         return xhea_table._make(vars[2:])
 
+    @cached
     def parse_name(self, table):
-        data = self.seg(self.data, table[2], table[3])
-        _, count, offset = struct.unpack_from(">3H", data, 0)
+        data = self.seg(self.data, table.offset, table.length)
+        _, count, offset = NAME_HEADER.unpack_from(data, 0)
+        storage = self.seg(data, offset, len(data) - offset)
+        strings = {}
         name_list = []
-        for i in range(count):
-            entry = struct.unpack_from(">6H", data, 6 + 12 * i)
+        for entry in self.iter_records(NAME_RECORD, data, NAME_HEADER.size, count):
             if entry[0] == 3:
-                string_b = self.seg(data, offset + entry[5], entry[4])
-                if entry[1] == 4:
-                    string_u = string_b.decode("cp936")
-                elif entry[1] == 5:
-                    string_u = string_b.decode("cp950")
-                elif entry[1] == 6:
-                    string_u = string_b.decode("cp949")
-                elif entry[1] == 7:
-                    string_u = string_b.decode("johab")
-                else:
-                    string_u = string_b.decode("utf_16_be")
-                name_list.append(name_entry._make([*entry[:4], string_u]))
+                key = (entry[1], entry[5], entry[4])
+                if key not in strings:
+                    string_b = bytes(self.seg(storage, entry[5], entry[4]))
+                    strings[key] = LazyString(string_b, name_decoder.get(entry[1], utf_16_be_decoder))
+                name_list.append(name_entry._make([*entry[:4], strings[key]]))
         return name_list
 
+    @cached
     def parse_head(self, table):
-        data = self.seg(self.data, table[2], table[3])
-        vars = struct.unpack_from(">2H3L2H2Q4h2H3h", data, 0)
+        vars = HEAD_TABLE.unpack_from(self.data, table.offset)
         return head_table._make(vars)
 
+    @cached
     def parse_gsub_gpos(self, table):
-        data = self.seg(self.data, table[2], table[3])
-        _, _, s_list_offset, f_list_offset, _ = struct.unpack_from(">5H", data, 0)
+        data = self.seg(self.data, table.offset, table.length)
+        _, _, s_list_offset, f_list_offset, _ = LAYOUT_HEADER.unpack_from(data, 0)
         s_list = []
-        s_list_count = struct.unpack_from(">H", data, s_list_offset)[0]
-        for x in range(s_list_count):
-            script_tag, s_offset = struct.unpack_from(">4sH", data, s_list_offset + 2 + 6 * x)
-            s_offset += s_list_offset
-            default_lang_sys_offset, l_count = struct.unpack_from(">2H", data, s_offset)
-            if default_lang_sys_offset:
-                default_lang_sys_offset += s_offset
-                _, required, f_count = struct.unpack_from(">3H", data, default_lang_sys_offset)
-                feature = struct.unpack_from(f">{f_count}H", data, default_lang_sys_offset + 6)
-                default_lang_sys = feature
-            else:
-                default_lang_sys = None
-            lang_sys = []
-            for y in range(l_count):
-                lang_tag, lang_sys_offset = struct.unpack_from(">4sH", data, s_offset + 4 + 6 * y)
-                lang_sys_offset += s_offset
-                _, required, f_count = struct.unpack_from(">3H", data, lang_sys_offset)
-                feature = struct.unpack_from(f">{f_count}H", data, lang_sys_offset + 6)
-                lang_sys.append((lang_tag.decode("u8"), required, feature))
-            s_list.append((script_tag.decode("u8"), default_lang_sys, lang_sys))
+        s_list_start = s_list_offset + U16.size
+        s_list_count = U16.unpack_from(data, s_list_offset)[0]
+        for script_tag, s_offset in self.iter_records(TAG_RECORD, data, s_list_start, s_list_count):
+            s_list.append((script_tag.decode("ascii", "replace"), s_list_offset + s_offset))
         f_list = []
-        f_list_count = struct.unpack_from(">H", data, f_list_offset)[0]
-        for x in range(f_list_count):
-            feature_tag, _ = struct.unpack_from(">4sH", data, f_list_offset + 2 + 6 * x)
-            f_list.append(feature_tag.decode("u8"))
+        f_list_start = f_list_offset + U16.size
+        f_list_count = U16.unpack_from(data, f_list_offset)[0]
+        for feature_tag, _ in self.iter_records(TAG_RECORD, data, f_list_start, f_list_count):
+            f_list.append(feature_tag.decode("ascii", "replace"))
         return s_list, f_list
 
-class DirectoryWidget(QScrollArea):
+    def parse_script(self, table, s_offset):
+        data = self.seg(self.data, table.offset, table.length)
+        default_lang_sys_offset, l_count = SCRIPT_TABLE.unpack_from(data, s_offset)
+        if default_lang_sys_offset:
+            default_lang_sys_offset += s_offset
+            _, required, f_count = LANG_SYS.unpack_from(data, default_lang_sys_offset)
+            feature = self.read_array("H", data, default_lang_sys_offset + LANG_SYS.size, f_count)
+            default_lang_sys = feature
+        else:
+            default_lang_sys = None
+        lang_sys = []
+        for lang_tag, lang_sys_offset in self.iter_records(TAG_RECORD, data, s_offset + SCRIPT_TABLE.size, l_count):
+            lang_sys_offset += s_offset
+            _, required, f_count = LANG_SYS.unpack_from(data, lang_sys_offset)
+            feature = self.read_array("H", data, lang_sys_offset + LANG_SYS.size, f_count)
+            lang_sys.append((lang_tag.decode("ascii", "replace"), required, feature))
+        return default_lang_sys, lang_sys
+
+class ParseSignals(QObject):
+    done = Signal(object)
+
+class ParseJob(QRunnable):
+    def __init__(self, filename):
+        super(ParseJob, self).__init__()
+        self.filename = filename
+        self.signals = ParseSignals()
+
+    def run(self):
+        self.signals.done.emit(FileParser(self.filename))
+
+class DirectoryModel(QAbstractItemModel):
+    # internalId is 0 for a font row, otherwise font index + 1 of a table row
+    header = table_record._fields
+    column_format = (
+        lambda one: one.tag.decode("ascii", "replace"),
+        "0x{0.checksum:08X}".format,
+        "{0.offset}".format,
+        "{0.length}".format,
+    )
+
+    def __init__(self, font_list, *args, **kwargs):
+        super(DirectoryModel, self).__init__(*args, **kwargs)
+        self.font_list = font_list
+        self.flat = len(font_list) == 1
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if parent.isValid():
+            return self.createIndex(row, column, parent.row() + 1)
+        return self.createIndex(row, column, 1 if self.flat else 0)
+
+    def parent(self, index):
+        i = index.internalId()
+        if not index.isValid() or self.flat or i == 0:
+            return QModelIndex()
+        return self.createIndex(i - 1, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.font_list[0]) if self.flat else len(self.font_list)
+        if parent.internalId() == 0 and parent.column() == 0:
+            return len(self.font_list[parent.row()])
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.header)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.header[section]
+
+    def table(self, index):
+        i = index.internalId()
+        if not index.isValid() or i == 0:
+            return None
+        return self.font_list[i - 1][index.row()]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        one = self.table(index)
+        c = index.column()
+        if one is None:
+            return f"Index={index.row()}" if c == 0 else None
+        return self.column_format[c](one)
+
+class RecordModel(QAbstractTableModel):
+    def __init__(self, rows, columns=None, labels=None, *args, **kwargs):
+        super(RecordModel, self).__init__(*args, **kwargs)
+        self.rows = rows
+        self.columns = columns
+        self.labels = labels
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.columns) if self.columns else 1
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal and self.columns:
+                return self.columns[section]
+            if orientation == Qt.Vertical and self.labels:
+                return self.labels[section]
+        return super(RecordModel, self).headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        value = self.rows[index.row()][index.column()]
+        if role == Qt.ToolTipRole and isinstance(value, int):
+            return None
+        return f"{value}"
+
+class DirectoryWidget(QWidget):
+    dialog_builders = {
+        b"name": "name_dialog",
+        b"head": "head_dialog",
+        b"GPOS": "gsub_gpos_dialog",
+        b"GSUB": "gsub_gpos_dialog",
+        b"hhea": "xhea_dialog",
+        b"vhea": "xhea_dialog",
+    }
+
     def __init__(self, filename, *args, **kwargs):
         super(DirectoryWidget, self).__init__(*args, **kwargs)
-        self.p = FileParser(filename)
-        l = len(self.p.font_list)
-        layout = QVBoxLayout()
-        if l >= 1:
-            layout.addWidget(QLabel(f"File path: '{filename}'"))
-        if l > 1:
-            for x_idx, x in enumerate(self.p.font_list):
-                g = QGroupBox(f"Index={x_idx}")
-                g_layout = QVBoxLayout()
-                for y in x:
-                    self.format_table(y, g_layout)
-                g.setLayout(g_layout)
-                layout.addWidget(g)
-        elif l == 1:
-            for y in self.p.font_list[0]:
-                self.format_table(y, layout)
-        else:
-            label = QLabel(f"Failed to parse file '{filename}'")
-            layout.addWidget(label)
-        widget = QWidget()
-        self.setWidgetResizable(True)
-        self.setWidget(widget)
-        widget.setLayout(layout)
-
-    def format_table(self, one, layout):
-        t = one[0].decode("u8")
-        c = "0x%08X" % one[1]
-        o = "%10d" % one[2]
-        l = "%10d" % one[3]
-        label = QLabel(f"{t}, {c}, {o}, {l}")
-        h = QHBoxLayout()
-        h.addWidget(label)
-        b = QPushButton("show")
-        h.addWidget(b)
-        if t == "name":
-            b.clicked.connect(lambda checked, table=one: self.show_name(table))
-        elif t == "head":
-            b.clicked.connect(lambda checked, table=one: self.show_head(table))
-        elif t in ["GPOS", "GSUB"]:
-            b.clicked.connect(lambda checked, table=one: self.show_gsub_gpos(table))
-        elif t in ["hhea", "vhea"]:
-            b.clicked.connect(lambda checked, table=one: self.show_xhea(table))
+        self.filename = filename
+        self.p = None
+        self.closed = False
+        self.dialogs = {}
+        self.message_box = QMessageBox(self)
+        self.message_box.setIcon(QMessageBox.Information)
+        self.message_box.setText("not implemented ...")
+        self.status = QLabel(f"Loading '{filename}' ...")
+        QVBoxLayout(self).addWidget(self.status)
+        self.job = ParseJob(filename)
+        self.job.signals.done.connect(self.show_directory)
+        QThreadPool.globalInstance().start(self.job)
+
+    def show_directory(self, parser):
+        if self.closed:
+            parser.close()
+            return
+        self.p = parser
+        if self.p.font_list:
+            self.status.setText(f"File path: '{self.filename}'")
+            self.model = DirectoryModel(self.p.font_list, self)
+            view = QTreeView()
+            view.setUniformRowHeights(True)
+            view.setRootIsDecorated(not self.model.flat)
+            view.setModel(self.model)
+            view.expandAll()
+            view.activated.connect(self.show_table)
+            self.layout().addWidget(view)
         else:
-            b.clicked.connect(lambda checked, table=one: self.show_not_implemented_message(table))
-        layout.addLayout(h)
+            self.status.setText(f"Failed to parse file '{self.filename}'")
+
+    def closeEvent(self, event):
+        self.closed = True
+        if self.p is not None:
+            self.p.close()
+        super(DirectoryWidget, self).closeEvent(event)
+
+    def show_table(self, index):
+        one = self.model.table(index)
+        if one is None:
+            return
+        key = (one.tag, one.offset)
+        if key not in self.dialogs:
+            builder = self.dialog_builders.get(one.tag)
+            if builder is None:
+                self.show_not_implemented_message(one)
+                return
+            self.dialogs[key] = getattr(self, builder)(one)
+        self.dialogs[key].exec()
 
     def show_not_implemented_message(self, table):
-        message_box = QMessageBox()
-        message_box.information(
-            self, f"'{table[0].decode('u8')}' table",
-            "not implemented ..."
-        )
+        self.message_box.setWindowTitle(f"'{table.tag.decode('ascii', 'replace')}' table")
+        self.message_box.exec()
 
-    def show_name(self, table):
-        data = self.p.parse_name(table)
-        dialog = QDialog()
-        dialog.setWindowTitle("'name' table")
+    def record_dialog(self, table, rows, columns=None, labels=None):
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"'{table.tag.decode('ascii', 'replace')}' table")
         dialog.setFixedSize(600, 400)
-        table = QTableWidget(dialog)
+        table = QTableView(dialog)
         table.setFixedSize(600, 400)
-        table.setRowCount(len(data))
-        table.setColumnCount(5)
-        for cid, col in enumerate(name_entry._fields):
-            table.setHorizontalHeaderItem(cid, QTableWidgetItem(col))
-        for rid, row in enumerate(data):
-            for cid, col in enumerate(row):
-                item = QTableWidgetItem(f"{col}")
-                table.setItem(rid, cid, item)
-                if cid == 4:
-                    item.setToolTip(f"{col}")
-        dialog.exec()
-
-    def show_head(self, table):
+        table.setModel(RecordModel(rows, columns, labels, dialog))
+        return dialog
+
+    def name_dialog(self, table):
+        data = self.p.parse_name(table)
+        return self.record_dialog(table, data, columns=name_entry._fields)
+
+    def head_dialog(self, table):
         data = self.p.parse_head(table)
-        dialog = QDialog()
-        dialog.setWindowTitle("'head' table")
-        dialog.setFixedSize(600, 400)
-        table = QTableWidget(dialog)
-        table.setFixedSize(600, 400)
-        table.setRowCount(len(data))
-        table.setColumnCount(1)
-        for kid, key in enumerate(head_table._fields):
-            table.setVerticalHeaderItem(kid, QTableWidgetItem(key))
-        for vid, val in enumerate(data):
-            table.setItem(vid, 0, QTableWidgetItem(f"{val}"))
-        dialog.exec()
-
-    def show_xhea(self, table):
+        return self.record_dialog(table, [(x,) for x in data], labels=head_table._fields)
+
+    def xhea_dialog(self, table):
         data = self.p.parse_xhea(table)
-        dialog = QDialog()
-        tag = table[0].decode('u8')
-        dialog.setWindowTitle(f"'{tag}' table")
-        dialog.setFixedSize(600, 400)
-        table = QTableWidget(dialog)
-        table.setFixedSize(600, 400)
-        table.setRowCount(len(data))
-        table.setColumnCount(1)
-        for kid, key in enumerate(xhea_table._fields):
-            real_key = key
-            if tag == "vhea":
-                real_key = key
-                for src, dst in xhea_translation.items():
-                    real_key = real_key.replace(src, dst)
-            table.setVerticalHeaderItem(kid, QTableWidgetItem(real_key))
-        for vid, val in enumerate(data):
-            table.setItem(vid, 0, QTableWidgetItem(f"{val}"))
-        dialog.exec()
-
-    def show_gsub_gpos(self, table):
-        data = self.p.parse_gsub_gpos(table)
-        dialog = QDialog()
-        dialog.setWindowTitle(f"'{table[0].decode('u8')}' table")
+        labels = vhea_fields if table.tag == b"vhea" else xhea_table._fields
+        return self.record_dialog(table, [(x,) for x in data], labels=labels)
+
+    def gsub_gpos_dialog(self, table):
+        s_list, f_list = self.p.parse_gsub_gpos(table)
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"'{table.tag.decode('ascii', 'replace')}' table")
         dialog.setFixedSize(600, 400)
         scroll = QScrollArea(dialog)
         scroll.setFixedSize(600, 400)
@@ -261,44 +420,34 @@ class DirectoryWidget(QScrollArea):
         scroll.setWidgetResizable(True)
         widget = QWidget()
         layout = QVBoxLayout(widget)
-        f_count = len(data[1])
-        for s in data[0]:
-            s_tag, s_dflt, s_list = s
+        for s_tag, s_offset in s_list:
             group = QGroupBox(s_tag)
+            group.setCheckable(True)
+            group.setChecked(False)
+            group.toggled.connect(partial(self.fill_script, group, table, s_offset, f_list))
             layout.addWidget(group)
-            lang_layout = QVBoxLayout(group)
-            if s_dflt:
-                lang_layout.addWidget(QLabel("DFLT"))
-                tag_widget = QListWidget()
-                tag_widget.setFlow(QListView.LeftToRight)
-                for l in s_dflt:
-                    if l < f_count:
-                        tag_widget.addItem("%s" % data[1][l])
-                lang_layout.addWidget(tag_widget)
-            if s_list:
-                for l_tag, l_req, l_list in s_list:
-                    print(l_req)
-                    lang_layout.addWidget(QLabel(l_tag))
-                    tag_widget = QListWidget()
-                    tag_widget.setFlow(QListView.LeftToRight)
-                    for l in l_list:
-                        if l < f_count:
-                            item = QListWidgetItem("%s" % data[1][l])
-                            if l == l_req:
-                                item.setTextColor(QColor.red)
-                            tag_widget.addItem(item)
-                    lang_layout.addWidget(tag_widget)
+        layout.addStretch()
         scroll.setWidget(widget)
-        dialog.exec()
+        return dialog
 
-def get_platform_style():
-    p = sys.platform
-    n = "Courier"
-    if p == "nt":
-        n = "Consolas"
-    elif p == "darwin":
-        n = "Menlo"
-    return "* {font-family: '%s';}" % n
+    def fill_script(self, group, table, s_offset, f_list, checked=True):
+        if not checked or group.layout() is not None:
+            return
+        s_dflt, s_list = self.p.parse_script(table, s_offset)
+        f_count = len(f_list)
+        lines = []
+        lang_sys = [("DFLT", None, s_dflt)] if s_dflt else []
+        for l_tag, l_req, l_list in lang_sys + s_list:
+            names = []
+            for l in l_list:
+                if l < f_count:
+                    name = escape(f_list[l])
+                    names.append(f"<font color='red'>{name}</font>" if l == l_req else name)
+            lines.append(f"<b>{escape(l_tag)}</b>: {' '.join(names)}")
+        label = QLabel("<br>".join(lines))
+        label.setTextFormat(Qt.RichText)
+        label.setWordWrap(True)
+        QVBoxLayout(group).addWidget(label)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -310,7 +459,7 @@ if __name__ == "__main__":
     if (filename := args.filename) and os.path.isfile(filename):
         app = QApplication()
         app.setWindowIcon(QIcon.fromTheme(QIcon.ThemeIcon.Scanner))
-        app.setStyleSheet(get_platform_style())
+        app.setStyleSheet(PLATFORM_STYLE)
         widget = DirectoryWidget(filename)
         widget.setWindowTitle("SFNT Proofer")
         widget.setFixedSize(450, 400)